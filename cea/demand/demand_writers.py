@@ -4,13 +4,64 @@ that sums the values up monthly. See the `cea.analysis.sensitivity.sensitivity_d
 the `MonthlyDemandWriter`.
 """
 
+import functools
+
 import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame as gdf
+import geojson
 from geojson import Feature, FeatureCollection
+from numba import jit
+from pyarrow import feather
 
 FLOAT_FORMAT = '%.3f'
 
+# fast compression for the hdf5 results: lz4 compresses at roughly the speed the data can be written
+HDF_COMPLIB = 'blosc:lz4'
+HDF_COMPLEVEL = 1
+
+
+def _nan_to_num(values):
+    """Same as `np.nan_to_num`, but returns `values` untouched (no copy) when it holds no NaN or Inf."""
+    if np.isfinite(values).all():
+        return values
+    return np.nan_to_num(values)
+
+
+def _to_hdf(df, path, key):
+    """Write `df` to `path` as a compressed hdf5 table"""
+    df.to_hdf(path, key=key, format='table', complib=HDF_COMPLIB, complevel=HDF_COMPLEVEL)
+
+
+@jit(nopython=True, cache=True)
+def _calc_monthly_totals_and_peaks(values, months, number_of_months):
+    """
+    Sum up and find the maximum of each column of `values` per month, skipping NaN like pandas does.
+
+    :param values: hourly values, one column per variable
+    :param months: the (0-based) month of each row in `values`
+    :param number_of_months: number of months to return (rows of the results)
+    :return: (totals, peaks), each an array of shape (number_of_months, number of columns in `values`)
+    """
+    totals = np.zeros((number_of_months, values.shape[1]))
+    peaks = np.full((number_of_months, values.shape[1]), np.nan)
+    for j in range(values.shape[1]):
+        for i in range(values.shape[0]):
+            value = values[i, j]
+            if np.isnan(value):
+                continue
+            month = months[i]
+            totals[month, j] += value
+            if not value <= peaks[month, j]:  # also true while the peak is still NaN
+                peaks[month, j] = value
+    return totals, peaks
+
+
+@functools.lru_cache(maxsize=None)
+def _ah_property_keys(time_steps):
+    """The names of the hourly anthropogenic heat properties of a feature, e.g. `AH_0:MW` ... `AH_23:MW`"""
+    return tuple(f"AH_{time_step}:MW" for time_step in range(time_steps))
+
 
 class DemandWriter(object):
     """
@@ -31,6 +82,23 @@ class DemandWriter(object):
 
         self.OTHER_VARS = ['Name', 'Af_m2', 'Aroof_m2', 'GFA_m2', 'Aocc_m2', 'people0']
 
+        # the layout of the hourly results is the same for every building, so work it out only once
+        self.hourly_columns = ['Name', 'people', 'x_int']
+        self.hourly_columns.extend([x + '_kWh' for x in self.load_vars])
+        self.hourly_columns.extend([x + '_kWh' for x in self.load_plotting_vars])
+        self.hourly_columns.extend([x + '_kWperC' for x in self.mass_flow_vars])
+        self.hourly_columns.extend([x + '_C' for x in self.temperature_vars])
+
+        # map each (unique) numeric hourly column to the tsd key it is read from and the factor it is divided by:
+        # loads from W to kW, mass flows from W/C to kW/C, temperatures stay in C
+        hourly_series = dict((x + '_kWh', (x, 1000.0)) for x in self.load_vars)
+        hourly_series.update(dict((x + '_kWh', (x, 1000.0)) for x in self.load_plotting_vars))
+        hourly_series.update(dict((x + '_kWperC', (x, 1000.0)) for x in self.mass_flow_vars))
+        hourly_series.update(dict((x + '_C', (x, 1.0)) for x in self.temperature_vars))
+        self.hourly_series_columns = list(hourly_series.keys())
+        self.hourly_series_keys = [key for key, _ in hourly_series.values()]
+        self.hourly_series_divisors = np.array([divisor for _, divisor in hourly_series.values()])
+
     def results_to_hdf5(self, tsd, bpr, locator, date, building_name):
         columns, hourly_data = self.calc_hourly_dataframe(building_name, date, tsd)
         self.write_to_hdf5(building_name, columns, hourly_data, locator)
@@ -40,30 +108,33 @@ class DemandWriter(object):
         # save to disc
         partial_total_data = pd.DataFrame(data, index=[0])
         partial_total_data.drop('Name', inplace=True, axis=1)
+        # a single row: the (uncompressed) fixed format is smaller and faster than a table here
         partial_total_data.to_hdf(
             locator.get_temporary_file('%(building_name)sT.hdf' % locals()),
-            key='dataset')
+            key='dataset', format='fixed')
 
     def results_to_csv(self, tsd, bpr, locator, date, building_name):
         # save hourly data
         columns, hourly_data = self.calc_hourly_dataframe(building_name, date, tsd)
         self.write_to_csv(building_name, columns, hourly_data, locator)
 
-        # save annual values to a temp file for YearlyDemandWriter
+        # save annual values to a temp file for YearlyDemandWriter (feather is much faster to read back than csv)
         columns, data = self.calc_yearly_dataframe(bpr, building_name, tsd)
-        pd.DataFrame(data, index=[0]).to_csv(
-            locator.get_temporary_file('%(building_name)sT.csv' % locals()),
-            index=False, columns=columns, float_format='%.3f', na_rep='nan')
+        feather.write_feather(pd.DataFrame([data], columns=columns),
+                              locator.get_temporary_file('%(building_name)sT.feather' % locals()))
 
     def calc_yearly_dataframe(self, bpr, building_name, tsd):
         # if printing total values is necessary
         # treating timeseries data from W to MWh
-        data = dict((x + '_MWhyr', np.nan_to_num(tsd[x]).sum() / 1000000) for x in self.load_vars)
-        data.update(dict((x + '0_kW', np.nan_to_num(tsd[x]) .max() / 1000) for x in self.load_vars))
+        # stack all loads so that the totals and peaks are computed in a single pass each
+        loads = _nan_to_num(np.asarray([tsd[x] for x in self.load_vars], dtype=np.float64))
+        totals = loads.sum(axis=1) / 1000000
+        peaks = loads.max(axis=1) / 1000
+        data = dict((x + '_MWhyr', totals[i]) for i, x in enumerate(self.load_vars))
+        data.update(dict((x + '0_kW', peaks[i]) for i, x in enumerate(self.load_vars)))
         # get order of columns
-        keys = data.keys()
-        columns = self.OTHER_VARS
-        columns.extend(keys)
+        # (build a new list: extending self.OTHER_VARS in place would make it grow with every call)
+        columns = self.OTHER_VARS + list(data.keys())
         # add other default elements
         data.update({'Name': building_name, 'Af_m2': bpr.rc_model['Af'], 'Aroof_m2': bpr.rc_model['Aroof'],
                      'GFA_m2': bpr.rc_model['GFA_m2'], 'Aocc_m2': bpr.rc_model['Aocc'],
@@ -71,29 +142,20 @@ class DemandWriter(object):
         return columns, data
 
     def calc_hourly_dataframe(self, building_name, date, tsd):
-        # treating time series data of loads from W to kW
-        data = dict((x + '_kWh', np.nan_to_num(tsd[x]) / 1000) for x in
-                    self.load_vars)  # TODO: convert nan to num at the very end.
-        # treating time series data of loads from W to kW
-        data.update(dict((x + '_kWh', np.nan_to_num(tsd[x]) / 1000) for x in
-                         self.load_plotting_vars))  # TODO: convert nan to num at the very end.
-        # treating time series data of mass_flows from W/C to kW/C
-        data.update(dict((x + '_kWperC', np.nan_to_num(tsd[x]) / 1000) for x in
-                         self.mass_flow_vars))  # TODO: convert nan to num at the very end.
-        # treating time series data of temperatures from W/C to kW/C
-        data.update(dict((x + '_C', np.nan_to_num(tsd[x])) for x in
-                         self.temperature_vars))  # TODO: convert nan to num at the very end.
-        # get order of columns
-        columns = ['Name', 'people', 'x_int']
-        columns.extend([x + '_kWh' for x in self.load_vars])
-        columns.extend([x + '_kWh' for x in self.load_plotting_vars])
-        columns.extend([x + '_kWperC' for x in self.mass_flow_vars])
-        columns.extend([x + '_C' for x in self.temperature_vars])
-        # add other default elements
-        data.update({'DATE': date, 'Name': building_name, 'people': tsd['people'], 'x_int': tsd['x_int'] * 1000})
+        # fill the numeric time series column by column (fortran order keeps each column contiguous, which is also
+        # the layout pandas stores them in) and convert nan to num / the units for all of them at once
+        values = np.empty((len(date), len(self.hourly_series_keys)), order='F')
+        for i, key in enumerate(self.hourly_series_keys):
+            values[:, i] = tsd[key]
+        values = _nan_to_num(values) / self.hourly_series_divisors
         # create dataframe with hourly values of selected data
-        hourly_data = pd.DataFrame(data).set_index('DATE')
-        return columns, hourly_data
+        hourly_data = pd.DataFrame(values, columns=self.hourly_series_columns,
+                                   index=pd.DatetimeIndex(date, name='DATE'))
+        # add other default elements
+        hourly_data['Name'] = building_name
+        hourly_data['people'] = np.asarray(tsd['people'])
+        hourly_data['x_int'] = np.asarray(tsd['x_int']) * 1000
+        return self.hourly_columns, hourly_data
 
 
 class HourlyDemandWriter(DemandWriter):
@@ -103,13 +165,25 @@ class HourlyDemandWriter(DemandWriter):
         super(HourlyDemandWriter, self).__init__(loads, massflows, temperatures)
 
     def write_to_csv(self, building_name, columns, hourly_data, locator):
-        hourly_data.to_csv(locator.get_demand_results_file(building_name, 'csv'), columns=columns,
-                           float_format=FLOAT_FORMAT, na_rep='nan')
+        # format the rows in one go instead of going through the generic DataFrame.to_csv machinery. floats are
+        # written with FLOAT_FORMAT (which also renders NaN as 'nan'), everything else as-is - just like to_csv
+        row_format = ','.join(['%s'] + [FLOAT_FORMAT if np.issubdtype(hourly_data[column].dtype, np.floating)
+                                        else '%s' for column in columns]) + '\n'
+        dates = hourly_data.index.strftime('%Y-%m-%d %H:%M:%S')
+        values = [hourly_data[column].tolist() for column in columns]
+        with open(locator.get_demand_results_file(building_name, 'csv'), 'w') as results_file:
+            results_file.write(','.join([hourly_data.index.name] + columns) + '\n')
+            results_file.write(''.join([row_format % row for row in zip(dates, *values)]))
 
     def write_to_hdf5(self, building_name, columns, hourly_data, locator):
         # fixing columns with strings
         hourly_data.drop('Name', inplace=True, axis=1)
-        hourly_data.to_hdf(locator.get_demand_results_file(building_name, 'hdf'), key='dataset')
+        # store as float32 (~7 significant digits) to halve the size of the hourly files. the calculations (and the
+        # monthly / yearly aggregations) are still done in float64. values out of the float32 range (e.g. the largest
+        # float64 that _nan_to_num puts in place of inf) are clipped, as they would otherwise turn into inf again
+        float32_range = np.finfo(np.float32)
+        hourly_data = hourly_data.clip(float32_range.min, float32_range.max).astype(np.float32)
+        _to_hdf(hourly_data, locator.get_demand_results_file(building_name, 'hdf'), key='dataset')
 
 
 class MonthlyDemandWriter(DemandWriter):
@@ -129,21 +203,18 @@ class MonthlyDemandWriter(DemandWriter):
     def write_to_hdf5(self, building_name, columns, hourly_data, locator):
         # get monthly totals and rename to MWhyr
         monthly_data_new = self.calc_monthly_dataframe(building_name, hourly_data)
-        monthly_data_new.to_hdf(locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
+        _to_hdf(monthly_data_new, locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
 
     def calc_monthly_dataframe(self, building_name, hourly_data):
-        monthly_data = hourly_data[[x + '_kWh' for x in self.load_vars]].groupby(
-            by=[hourly_data.index.month]).sum() / 1000
-
-        monthly_data = monthly_data.rename(
-            columns=dict((x + '_kWh', x + '_MWhyr') for x in self.load_vars))
-
-        peaks = hourly_data[[x + '_kWh' for x in self.load_vars]].groupby(
-            by=[hourly_data.index.month]).max()
-
-        peaks = peaks.rename(
-            columns=dict((x + '_kWh', x + '0_kW') for x in self.load_vars))
-        monthly_data_new = monthly_data.merge(peaks, left_index=True, right_index=True)
+        # compute the monthly totals and peaks of all loads in a single sweep over the hourly values
+        values = hourly_data[[x + '_kWh' for x in self.load_vars]].to_numpy(dtype=np.float64)
+        months = hourly_data.index.month.to_numpy() - 1
+        totals, peaks = _calc_monthly_totals_and_peaks(values, months, len(self.MONTHS))
+
+        monthly_data_new = pd.DataFrame(np.hstack((totals / 1000, peaks)),
+                                        columns=[x + '_MWhyr' for x in self.load_vars] +
+                                                [x + '0_kW' for x in self.load_vars],
+                                        index=np.arange(1, len(self.MONTHS) + 1))
         monthly_data_new['Name'] = building_name
         monthly_data_new['Month'] = self.MONTHS
 
@@ -158,13 +229,8 @@ class YearlyDemandWriter(DemandWriter):
 
     def write_to_csv(self, list_buildings, locator):
         """read in the temporary results files and append them to the Totals.csv file."""
-        df = None
-        for name in list_buildings:
-            temporary_file = locator.get_temporary_file('%(name)sT.csv' % locals())
-            if df is None:
-                df = pd.read_csv(temporary_file)
-            else:
-                df = pd.concat([df, pd.read_csv(temporary_file)], ignore_index=True)
+        df = pd.concat([feather.read_feather(locator.get_temporary_file('%(name)sT.feather' % locals()))
+                        for name in list_buildings], ignore_index=True)
         df.to_csv(locator.get_total_demand('csv'), index=False, float_format='%.3f', na_rep='nan')
 
         # """read saved data of monthly values and return as totals"""
@@ -175,19 +241,13 @@ class YearlyDemandWriter(DemandWriter):
 
     def write_to_hdf5(self, list_buildings, locator):
         """read in the temporary results files and append them to the Totals.csv file."""
-        df = None
-        for name in list_buildings:
-            temporary_file = locator.get_temporary_file('%(name)sT.hdf' % locals())
-            if df is None:
-                df = pd.read_hdf(temporary_file, key='dataset')
-            else:
-                df = df.append(pd.read_hdf(temporary_file, key='dataset'))
-        df.to_hdf(locator.get_total_demand('hdf'), key='dataset')
-
-        """read saved data of monthly values and return as totals"""
-        monthly_data_buildings = [pd.read_hdf(locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
-                                  for building_name in
-                                  list_buildings]
+        df = pd.concat([pd.read_hdf(locator.get_temporary_file('%(name)sT.hdf' % locals()), key='dataset')
+                        for name in list_buildings], ignore_index=True)
+        _to_hdf(df, locator.get_total_demand('hdf'), key='dataset')
+
+        # saved data of monthly values: returned as a generator so the files are only read if the caller needs them
+        monthly_data_buildings = (pd.read_hdf(locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
+                                  for building_name in list_buildings)
         return df, monthly_data_buildings
 
 class AnthropogenicHeatWriter(object):
@@ -203,8 +263,7 @@ class AnthropogenicHeatWriter(object):
     def load_building_locations(self):
         """Load the building locations"""
         zone = gdf.from_file(self._locator.get_zone_geometry())
-        building_locations = {building["Name"]: building["geometry"].representative_point()
-                              for row, building in zone.iterrows()}
+        building_locations = dict(zip(zone["Name"], zone.geometry.representative_point()))
         return building_locations
 
     def form_ah_features(self, all_building_ah_emissions):
@@ -215,31 +274,35 @@ class AnthropogenicHeatWriter(object):
         building_ah_features_thermal_energy_system = {}
         building_ah_features_industrial_processes = {}
 
+        # index the emissions by building name once, instead of searching through the list for each building and date
+        ah_emissions_by_building = {ah_emission.building: ah_emission for ah_emission in all_building_ah_emissions}
+
         for date in self.sampling_dates:
             ah_features_thermal_energy_system = []
             ah_features_industrial_processes = []
 
             for building in self.building_names:
                 # Extract the anthropogenic heat emissions for the building on the date
-                building_ah_emissions = next((ah_emission for ah_emission in all_building_ah_emissions
-                                              if ah_emission.building == building), None)
+                building_ah_emissions = ah_emissions_by_building.get(building)
                 if building_ah_emissions is None:
                     print(f"No anthropogenic heat emissions for {building}")
                     continue
                 building_tes_ah_on_date = building_ah_emissions.heat_emissions[date]['thermal_energy_system']
                 building_ip_ah_on_date = building_ah_emissions.heat_emissions[date]['industrial_processes']
                 # Construct properties of feature for heat emissions from the building's thermal energy system
-                if sum(building_tes_ah_on_date.profile) > 0:
-                    tes_properties = {f"AH_{time_step}:MW": round(building_tes_ah_on_date.profile[time_step] / 1e6, 6)
-                                      for time_step in range(building_tes_ah_on_date.time_steps)}
+                tes_profile = np.asarray(building_tes_ah_on_date.profile, dtype=np.float64)
+                if tes_profile.sum() > 0:
+                    tes_properties = dict(zip(_ah_property_keys(building_tes_ah_on_date.time_steps),
+                                              np.round(tes_profile / 1e6, 6).tolist()))
                     tes_properties["building_name"] = building
                     # Create the feature
                     ah_features_thermal_energy_system.append(
                         Feature(geometry=self.building_locations[building], properties=tes_properties))
                 # Construct properties of feature for heat emissions from the building's industrial processes
-                if sum(building_ip_ah_on_date.profile) > 0:
-                    ip_properties = {f"AH_{time_step}:MW": round(building_ip_ah_on_date.profile[time_step] / 1e6, 6)
-                                  for time_step in range(building_ip_ah_on_date.time_steps)}
+                ip_profile = np.asarray(building_ip_ah_on_date.profile, dtype=np.float64)
+                if ip_profile.sum() > 0:
+                    ip_properties = dict(zip(_ah_property_keys(building_ip_ah_on_date.time_steps),
+                                             np.round(ip_profile / 1e6, 6).tolist()))
                     ip_properties["building_name"] = building
                     # Create the feature
                     ah_features_industrial_processes.append(
@@ -262,8 +325,16 @@ class AnthropogenicHeatWriter(object):
         for date in dates:
             if len(self.building_ah_features['thermal_energy_system'][date].features) > 0:
                 with open(self._locator.get_ah_emission_results_file(date, solution='base_TES'), 'w') as file:
-                    file.write(str(self.building_ah_features['thermal_energy_system'][date]))
+                    self._dump_feature_collection(self.building_ah_features['thermal_energy_system'][date], file)
 
             if len(self.building_ah_features['industrial_processes'][date].features) > 0:
                 with open(self._locator.get_ah_emission_results_file(date, solution='base_IP'), 'w') as file:
-                    file.write(str(self.building_ah_features['industrial_processes'][date]))
+                    self._dump_feature_collection(self.building_ah_features['industrial_processes'][date], file)
+
+    @staticmethod
+    def _dump_feature_collection(feature_collection, file):
+        """
+        Stream a FeatureCollection to an open file. Same output as `str(feature_collection)`, but without building the
+        whole string in memory first and without the optional whitespace.
+        """
+        geojson.dump(feature_collection, file, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
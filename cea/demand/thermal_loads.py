@@ -53,7 +53,7 @@ def calc_thermal_loads(building_name, bpr, weather_data, date_range, sampling_da
 
     * temporary folder (as returned by ``tempfile.gettempdir()``)
 
-      * ``${Name}T.csv`` for each building
+      * ``${Name}T.feather`` for each building
 
     daren-thomas: as far as I can tell, these are the only side-effects.
 
@@ -317,7 +317,9 @@ class PlotBase(object):
             time_data = dataframe.copy()
 
         # Remove timezone data (found in technology potential files)
-        time_data.index = pd.to_datetime(time_data.index.map(lambda x: pd.Timestamp(x))).tz_localize(None)
+        if not isinstance(time_data.index, pd.DatetimeIndex):
+            time_data.index = pd.to_datetime(time_data.index.map(lambda x: pd.Timestamp(x)))
+        time_data.index = time_data.index.tz_localize(None)
 
         if self.timeframe == "daily":
             time_data = time_data.resample('D').sum()
@@ -52,29 +52,27 @@ class SupplySystemPlotBase(PlotBase):
         else:
             super(SupplySystemPlotBase, self).missing_input_files()
 
+    def read_time_data(self, data_path):
+        """Read a time series file and resample it to ``self.timeframe``. The DATE column is parsed by the csv reader,
+        so ``resample_time_data`` doesn't need to convert each timestamp again."""
+        data = pd.read_csv(data_path, index_col='DATE', parse_dates=['DATE'])
+        return self.resample_time_data(data)
+
     def process_individual_dispatch_curve_heating(self):
-        data_path = self.locator.get_optimization_slave_heating_activation_pattern(self.individual, self.generation)
-        data = pd.read_csv(data_path)
-        data = self.resample_time_data(data)
-        return data
+        return self.read_time_data(
+            self.locator.get_optimization_slave_heating_activation_pattern(self.individual, self.generation))
 
     def process_individual_dispatch_curve_cooling(self):
-        data_path = self.locator.get_optimization_slave_cooling_activation_pattern(self.individual, self.generation)
-        data = pd.read_csv(data_path)
-        data = self.resample_time_data(data)
-        return data
+        return self.read_time_data(
+            self.locator.get_optimization_slave_cooling_activation_pattern(self.individual, self.generation))
 
     def process_individual_dispatch_curve_electricity(self):
-        data_path = self.locator.get_optimization_slave_electricity_activation_pattern(self.individual, self.generation)
-        data = pd.read_csv(data_path)
-        data = self.resample_time_data(data)
-        return data
+        return self.read_time_data(
+            self.locator.get_optimization_slave_electricity_activation_pattern(self.individual, self.generation))
 
     def process_individual_requirements_curve_electricity(self):
-        data_path = self.locator.get_optimization_slave_electricity_requirements_data(self.individual, self.generation)
-        data = pd.read_csv(data_path)
-        data = self.resample_time_data(data)
-        return data
+        return self.read_time_data(
+            self.locator.get_optimization_slave_electricity_requirements_data(self.individual, self.generation))
 
     def process_individual_ramping_capacity(self):
         data_el_exports_imports = pd.read_csv(
@@ -2,17 +2,18 @@
 Photovoltaic
 """
 
+import functools
 import os
 import time
 from itertools import repeat
-from math import radians, degrees, asin, sin, acos, cos, exp, tan, atan, ceil, log
+from math import radians, degrees, asin, sin, acos, cos, exp, tan, atan, log
 from multiprocessing.dummy import Pool
 
 import numpy as np
 import pandas as pd
 import pvlib
 from geopandas import GeoDataFrame as gdf
-from scipy import interpolate
+from numba import jit
 
 import cea.config
 import cea.inputlocator
@@ -33,8 +34,16 @@ __maintainer__ = "Daren Thomas"
 __email__ = "cea@arch.ethz.ch"
 __status__ = "Production"
 
+# angle limits of the absorbed radiation calculation [rad], to avoid inconvergence when I_sol = 0
+MAX_ANGLE_RAD = radians(89.999)
+MAX_SZ_DIRECT_RAD = radians(85)  # no direct radiation is assumed when the sun is close to the horizon
 
-def calc_PV(locator, config, latitude, longitude, weather_data, datetime_local, building_name):
+# reflection loss of the glazing at normal incidence [-]
+REFLECTION_LOSS_NORMAL = ((constants.n - 1) / (constants.n + 1)) ** 2
+
+
+def calc_PV(locator, config, latitude, weather_data, datetime_local, solar_properties, panel_properties_PV,
+            building_name):
     """
     This function first determines the surface area with sufficient solar radiation, and then calculates the optimal
     tilt angles of panels at each surface location. The panels are categorized into groups by their surface azimuths,
@@ -44,8 +53,14 @@ def calc_PV(locator, config, latitude, longitude, weather_data, datetime_local,
     :type locator: cea.inputlocator.InputLocator
     :param latitude: latitude of the case study location
     :type latitude: float
-    :param longitude: longitude of the case study location
-    :type longitude: float
+    :param weather_data: weather data read from the epw file
+    :type weather_data: dataframe
+    :param datetime_local: local time of each hour of the weather file
+    :type datetime_local: DatetimeIndex
+    :param solar_properties: sun properties of the case study location, shared by all buildings
+    :type solar_properties: cea.utilities.solar_equations.SunProperties
+    :param panel_properties_PV: properties of the PV panel type, shared by all buildings
+    :type panel_properties_PV: Series
     :param building_name: list of building names in the case study
     :type building_name: Series
     :return: Building_PV.csv with PV generation potential of each building, Building_sensors.csv with sensor data of
@@ -57,14 +72,6 @@ def calc_PV(locator, config, latitude, longitude, weather_data, datetime_local,
     radiation_path = locator.get_radiation_building_sensors(building_name)
     metadata_csv_path = locator.get_radiation_metadata(building_name)
 
-    # solar properties
-    solar_properties = solar_equations.calc_sun_properties(latitude, longitude, weather_data, datetime_local, config)
-    print('calculating solar properties done')
-
-    # calculate properties of PV panel
-    panel_properties_PV = calc_properties_PV_db(locator.get_database_conversion_systems(), config)
-    print('gathering properties of PV panel')
-
     # select sensor point with sufficient solar radiation
     max_annual_radiation, annual_radiation_threshold, sensors_rad_clean, sensors_metadata_clean = \
         solar_equations.filter_low_potential(radiation_path, metadata_csv_path, config)
@@ -138,78 +145,63 @@ def calc_pv_generation(sensor_groups, weather_data, date_local, solar_properties
     hourly_radiation = sensor_groups['hourlydata_groups']  # mean hourly radiation of sensors in each group [Wh/m2]
 
     # convert degree to radians
-    lat = radians(latitude)
-    g_rad = np.radians(solar_properties.g)
-    ha_rad = np.radians(solar_properties.ha)
-    Sz_rad = np.radians(solar_properties.Sz)
-    Az_rad = np.radians(solar_properties.Az)
-
-    # empty list to store results
-    list_groups_area = [0 for i in range(number_groups)]
-    total_el_output_PV_kWh = [0 for i in range(number_groups)]
-    total_radiation_kWh = [0 for i in range(number_groups)]
-
-    potential = pd.DataFrame(index=range(HOURS_IN_YEAR))
-    panel_orientations = ['walls_south', 'walls_north', 'roofs_top', 'walls_east', 'walls_west']
-    for panel_orientation in panel_orientations:
-        potential['PV_' + panel_orientation + '_E_kWh'] = 0
-        potential['PV_' + panel_orientation + '_m2'] = 0
+    Sz_deg = solar_properties.Sz.to_numpy()
+    Az_deg = solar_properties.Az.to_numpy()
+    Sz_rad = np.radians(Sz_deg)
+    T_external_C = weather_data.drybulb_C.to_numpy()
+
+    # read panel properties of all groups
+    tilt_angle_deg = prop_observers['B_deg'].to_numpy(dtype=np.float64)  # tilt angle of panels
+    teta_z_deg = prop_observers['surface_azimuth_deg'].to_numpy(dtype=np.float64)
+    module_area_m2 = prop_observers['area_installed_module_m2'].to_numpy(dtype=np.float64)
+    type_orientation = prop_observers['type_orientation'].to_numpy()
+    # degree to radians
+    tilt_rad = np.radians(tilt_angle_deg)  # tilt angle
+    teta_z_rad = np.radians(teta_z_deg)  # surface azimuth
 
     eff_nom = panel_properties_PV['PV_n']
 
     Bref = panel_properties_PV['PV_Bref']
 
     misc_losses = panel_properties_PV['misc_losses']  # cabling, resistances etc..
-    for group in prop_observers.index.values:
-        # calculate radiation types (direct/diffuse) in group
-        radiation_Wperm2 = solar_equations.cal_radiation_type(group, hourly_radiation, weather_data)
-
-        # read panel properties of each group
-        teta_z_deg = prop_observers.loc[group, 'surface_azimuth_deg']
-        tot_module_area_m2 = prop_observers.loc[group, 'area_installed_module_m2']
-        tilt_angle_deg = prop_observers.loc[group, 'B_deg']  # tilt angle of panels
-        # degree to radians
-        tilt_rad = radians(tilt_angle_deg)  # tilt angle
-        teta_z_deg = radians(teta_z_deg)  # surface azimuth
-
-        # calculate effective incident angles necessary
-        teta_deg = pvlib.irradiance.aoi(tilt_angle_deg, teta_z_deg, solar_properties.Sz, solar_properties.Az)
-        teta_rad = teta_rad = [radians(x) for x in teta_deg]
-        teta_ed_rad, teta_eg_rad = calc_diffuseground_comp(tilt_rad)
-
-        absorbed_radiation_Wperm2 = np.vectorize(calc_absorbed_radiation_PV)(radiation_Wperm2.I_sol,
-                                                                             radiation_Wperm2.I_direct,
-                                                                             radiation_Wperm2.I_diffuse, tilt_rad,
-                                                                             Sz_rad, teta_rad, teta_ed_rad,
-                                                                             teta_eg_rad, panel_properties_PV)
-
-        T_cell_C = np.vectorize(calc_cell_temperature)(absorbed_radiation_Wperm2, weather_data.drybulb_C,
-                                                       panel_properties_PV)
-
-        el_output_PV_kW = np.vectorize(calc_PV_power)(absorbed_radiation_Wperm2, T_cell_C, eff_nom, tot_module_area_m2,
-                                                      Bref, misc_losses)
-
-        # write results from each group
-        panel_orientation = prop_observers.loc[group, 'type_orientation']
-        potential['PV_' + panel_orientation + '_E_kWh'] = potential[
-                                                              'PV_' + panel_orientation + '_E_kWh'] + el_output_PV_kW
-        potential['PV_' + panel_orientation + '_m2'] = potential['PV_' + panel_orientation + '_m2'] + tot_module_area_m2
-
-        # aggregate results from all modules
-        list_groups_area[group] = tot_module_area_m2
-        total_el_output_PV_kWh[group] = el_output_PV_kW
-        total_radiation_kWh[group] = (radiation_Wperm2['I_sol'] * tot_module_area_m2 / 1000)  # kWh
-
-    # check for missing groups and assign 0 as el_output_PV_kW
-    # panel_orientations = ['walls_south', 'walls_north', 'roofs_top', 'walls_east', 'walls_west']
-    # for panel_orientation in panel_orientations:
-    #     if panel_orientation not in prop_observers['type_orientation'].values:
-    #         potential['PV_' + panel_orientation + '_E_kWh'] = 0
-    #         potential['PV_' + panel_orientation + '_m2'] = 0
-
-    potential['E_PV_gen_kWh'] = sum(total_el_output_PV_kWh)
-    potential['radiation_kWh'] = sum(total_radiation_kWh).values
-    potential['Area_PV_m2'] = sum(list_groups_area)
+
+    # calculate radiation types (direct/diffuse) of all groups, one row per group
+    I_sol, I_diffuse, I_direct = solar_equations.calc_radiation_type_groups(hourly_radiation, weather_data)
+
+    # calculate effective incident angles of all groups at once [group, hour]
+    teta_deg = pvlib.irradiance.aoi(tilt_angle_deg[:, np.newaxis], teta_z_rad[:, np.newaxis], Sz_deg, Az_deg)
+    teta_rad = np.radians(teta_deg)
+
+    teta_ed_rad, teta_eg_rad = calc_diffuseground_comp(tilt_rad)
+
+    absorbed_radiation_Wperm2 = np.empty((number_groups, HOURS_IN_YEAR))
+    for group in range(number_groups):
+        absorbed_radiation_Wperm2[group] = calc_absorbed_radiation_PV(I_sol[group], I_direct[group], I_diffuse[group],
+                                                                      tilt_rad[group], Sz_rad, teta_rad[group],
+                                                                      teta_ed_rad[group], teta_eg_rad[group],
+                                                                      panel_properties_PV)
+
+    T_cell_C = calc_cell_temperature(absorbed_radiation_Wperm2, T_external_C, panel_properties_PV)
+
+    el_output_PV_kW = calc_PV_power(absorbed_radiation_Wperm2, T_cell_C, eff_nom, module_area_m2[:, np.newaxis], Bref,
+                                    misc_losses)
+
+    # write results of the groups of each orientation
+    potential = pd.DataFrame(index=range(HOURS_IN_YEAR))
+    panel_orientations = ['walls_south', 'walls_north', 'roofs_top', 'walls_east', 'walls_west']
+    for panel_orientation in panel_orientations:
+        in_orientation = type_orientation == panel_orientation
+        if in_orientation.any():
+            potential['PV_' + panel_orientation + '_E_kWh'] = el_output_PV_kW[in_orientation].sum(axis=0)
+            potential['PV_' + panel_orientation + '_m2'] = module_area_m2[in_orientation].sum()
+        else:
+            potential['PV_' + panel_orientation + '_E_kWh'] = 0
+            potential['PV_' + panel_orientation + '_m2'] = 0
+
+    # aggregate results from all modules
+    potential['E_PV_gen_kWh'] = el_output_PV_kW.sum(axis=0)
+    potential['radiation_kWh'] = (I_sol * module_area_m2[:, np.newaxis] / 1000).sum(axis=0)  # kWh
+    potential['Area_PV_m2'] = module_area_m2.sum()
     potential['Date'] = date_local
     potential = potential.set_index('Date')
 
@@ -277,21 +269,21 @@ def calc_diffuseground_comp(tilt_radians):
     """
     To calculate reflected radiation and diffuse radiation.
     :param tilt_radians:  surface tilt angle [rad]
-    :type tilt_radians: float
+    :type tilt_radians: float or np.array
     :return teta_ed: effective incidence angle from diffuse radiation [rad]
     :return teta_eg: effective incidence angle from ground-reflected radiation [rad]
-    :rtype teta_ed: float
-    :rtype teta_eg: float
+    :rtype teta_ed: float or np.array
+    :rtype teta_eg: float or np.array
 
     :References: Duffie, J. A. and Beckman, W. A. (2013) Radiation Transmission through Glazing: Absorbed Radiation, in
                  Solar Engineering of Thermal Processes, Fourth Edition, John Wiley & Sons, Inc., Hoboken, NJ, USA.
                  doi: 10.1002/9781118671603.ch5
 
     """
-    tilt = degrees(tilt_radians)
-    teta_ed = 59.68 - 0.1388 * tilt + 0.001497 * tilt ** 2  # [degrees] (5.4.2)
-    teta_eG = 90 - 0.5788 * tilt + 0.002693 * tilt ** 2  # [degrees] (5.4.1)
-    return radians(teta_ed), radians(teta_eG)
+    tilt = np.degrees(tilt_radians)
+    teta_ed = 59.68 + tilt * (-0.1388 + 0.001497 * tilt)  # [degrees] (5.4.2)
+    teta_eG = 90 + tilt * (-0.5788 + 0.002693 * tilt)  # [degrees] (5.4.1)
+    return np.radians(teta_ed), np.radians(teta_eG)
 
 
 def calc_absorbed_radiation_PV(I_sol, I_direct, I_diffuse, tilt, Sz, teta, tetaed, tetaeg, panel_properties_PV):
@@ -304,17 +296,17 @@ def calc_absorbed_radiation_PV(I_sol, I_direct, I_diffuse, tilt, Sz, teta, tetae
     :param teta: angle of incidence [rad]
     :param tetaed: effective incidence angle from diffuse radiation [rad]
     :param tetaeg: effective incidence angle from ground-reflected radiation [rad]
-    :type I_sol: float
-    :type I_direct: float
-    :type I_diffuse: float
+    :type I_sol: np.array
+    :type I_direct: np.array
+    :type I_diffuse: np.array
     :type tilt: float
-    :type Sz: float
-    :type teta: float
+    :type Sz: np.array
+    :type teta: np.array
     :type tetaed: float
     :type tetaeg: float
     :param panel_properties_PV: properties of the PV panel
     :type panel_properties_PV: dataframe
-    :return:
+    :return: absorbed radiation [W/m2] for every hour
 
     :References: Duffie, J. A. and Beckman, W. A. (2013) Radiation Transmission through Glazing: Absorbed Radiation, in
                  Solar Engineering of Thermal Processes, Fourth Edition, John Wiley & Sons, Inc., Hoboken, NJ, USA.
@@ -333,72 +325,87 @@ def calc_absorbed_radiation_PV(I_sol, I_direct, I_diffuse, tilt, Sz, teta, tetae
     a4 = panel_properties_PV['PV_a4']
     L = panel_properties_PV['PV_th']
 
-    # calculate ratio of beam radiation on a tilted plane
-    # to avoid inconvergence when I_sol = 0
-    lim1 = radians(0)
-    lim2 = radians(90)
-    lim3 = radians(89.999)
-
-    if teta < lim1:
-        teta = min(lim3, abs(teta))
-    if teta >= lim2:
-        teta = lim3
-
-    if Sz < lim1:
-        Sz = min(lim3, abs(Sz))
-    if Sz >= lim2:
-        Sz = lim3
-
-    # Rb: ratio of beam radiation of tilted surface to that on horizontal surface
-    if Sz <= radians(85):  # Sz is Zenith angle   # TODO: FIND REFERENCE
-        Rb = cos(teta) / cos(Sz)
-    else:
-        Rb = 0  # Assume there is no direct radiation when the sun is close to the horizon.
-
-    # calculate air mass modifier
-    m = 1 / cos(Sz)  # air mass
-    M = a0 + a1 * m + a2 * m ** 2 + a3 * m ** 3 + a4 * m ** 4  # air mass modifier
-    M = np.clip(M, 0.001, 1.1)  # De Soto et al., 2006
-
-    # incidence angle modifier for direct (beam) radiation
-    teta_r = asin(sin(teta) / n)  # refraction angle in radians(approximation according to Soteris A.) (5.1.4)
-    Ta_n = exp(-K * L) * (1 - ((n - 1) / (n + 1)) ** 2)
-    if teta < radians(90):  # 90 degrees in radians
-        part1 = teta_r + teta
-        part2 = teta_r - teta
-        Ta_B = exp((-K * L) / cos(teta_r)) * (
-                1 - 0.5 * ((sin(part2) ** 2) / (sin(part1) ** 2) + (tan(part2) ** 2) / (tan(part1) ** 2)))
-        kteta_B = Ta_B / Ta_n
-    else:
-        kteta_B = 0
-
-    # incidence angle modifier for diffuse radiation
-    teta_r = asin(sin(tetaed) / n)  # refraction angle for diffuse radiation [rad]
-    part1 = teta_r + tetaed
-    part2 = teta_r - tetaed
-    Ta_D = exp((-K * L) / cos(teta_r)) * (
-            1 - 0.5 * ((sin(part2) ** 2) / (sin(part1) ** 2) + (tan(part2) ** 2) / (tan(part1) ** 2)))
-    kteta_D = Ta_D / Ta_n
-
-    # incidence angle modifier for ground-reflected radiation
-    teta_r = asin(sin(tetaeg) / n)  # refraction angle for ground-reflected radiation [rad]
-    part1 = teta_r + tetaeg
-    part2 = teta_r - tetaeg
-    Ta_eG = exp((-K * L) / cos(teta_r)) * (
-            1 - 0.5 * ((sin(part2) ** 2) / (sin(part1) ** 2) + (tan(part2) ** 2) / (tan(part1) ** 2)))
-    kteta_eG = Ta_eG / Ta_n
-
-    # absorbed solar radiation
-    absorbed_radiation_Wperm2 = M * Ta_n * (
-            kteta_B * I_direct * Rb + kteta_D * I_diffuse * (1 + cos(tilt)) / 2 + kteta_eG * I_sol * Pg * (
-            1 - cos(tilt)) / 2)  # [W/m2] (5.12.1)
-    if absorbed_radiation_Wperm2 < 0.0:  # when points are 0 and too much losses
-        # print ('the absorbed radiation', absorbed_radiation_Wperm2 ,'is negative, please check calc_absorbed_radiation_PVT')
-        absorbed_radiation_Wperm2 = 0.0
+    # transmittance at normal incidence, used to normalise the incidence angle modifiers
+    Ta_n = exp(-K * L) * (1 - REFLECTION_LOSS_NORMAL)
+
+    # incidence angle modifiers for diffuse and ground-reflected radiation only depend on the tilt of the group,
+    # so they are evaluated once and folded with the sky/ground view factors into two scalar coefficients
+    kteta_D = calc_glazing_transmittance(tetaed, n, K, L) / Ta_n
+    kteta_eG = calc_glazing_transmittance(tetaeg, n, K, L) / Ta_n
+    diffuse_factor = kteta_D * (1 + cos(tilt)) / 2
+    ground_factor = kteta_eG * Pg * (1 - cos(tilt)) / 2
+
+    absorbed_radiation_Wperm2 = calc_absorbed_radiation_PV_hourly(np.asarray(I_sol, dtype=np.float64),
+                                                                  np.asarray(I_direct, dtype=np.float64),
+                                                                  np.asarray(I_diffuse, dtype=np.float64),
+                                                                  np.asarray(Sz, dtype=np.float64),
+                                                                  np.asarray(teta, dtype=np.float64),
+                                                                  diffuse_factor, ground_factor, Ta_n, n, K, L,
+                                                                  a0, a1, a2, a3, a4)
+    return absorbed_radiation_Wperm2
+
+
+@jit(nopython=True)
+def calc_absorbed_radiation_PV_hourly(I_sol, I_direct, I_diffuse, Sz, teta, diffuse_factor, ground_factor, Ta_n, n,
+                                      K, L, a0, a1, a2, a3, a4):
+    """
+    Hourly loop of :py:func:`calc_absorbed_radiation_PV`, all arrays are of the same length (one value per hour).
+    The terms that only depend on the tilt of the group (``diffuse_factor``, ``ground_factor``, ``Ta_n``) are computed
+    by the caller.
+    """
+    absorbed_radiation_Wperm2 = np.empty(len(teta))
+    for hour in range(len(teta)):
+        # fold negative angles and keep them below 90 degrees
+        teta_h = min(abs(teta[hour]), MAX_ANGLE_RAD)
+        Sz_h = min(abs(Sz[hour]), MAX_ANGLE_RAD)
+
+        # Rb: ratio of beam radiation of tilted surface to that on horizontal surface
+        # Sz is Zenith angle   # TODO: FIND REFERENCE
+        # Assume there is no direct radiation when the sun is close to the horizon.
+        Rb = cos(teta_h) / cos(Sz_h) if Sz_h <= MAX_SZ_DIRECT_RAD else 0.0
+
+        # calculate air mass modifier
+        m = 1 / cos(Sz_h)  # air mass
+        M = a0 + a1 * m + a2 * m ** 2 + a3 * m ** 3 + a4 * m ** 4  # air mass modifier
+        M = min(max(M, 0.001), 1.1)  # De Soto et al., 2006
+
+        # incidence angle modifier for direct (beam) radiation, teta_h is always below 90 degrees here
+        kteta_B = calc_glazing_transmittance(teta_h, n, K, L) / Ta_n
+
+        # absorbed solar radiation
+        absorbed = M * Ta_n * (kteta_B * I_direct[hour] * Rb + diffuse_factor * I_diffuse[hour] +
+                               ground_factor * I_sol[hour])  # [W/m2] (5.12.1)
+        # when points are 0 and too much losses
+        absorbed_radiation_Wperm2[hour] = max(absorbed, 0.0)
 
     return absorbed_radiation_Wperm2
 
 
+@jit(nopython=True)
+def calc_glazing_transmittance(teta, n, K, L):
+    """
+    To calculate the transmittance of the panel glazing (absorption and reflection losses) for a given incidence angle.
+
+    :param teta: incidence angle [rad]
+    :param n: refractive index of glass
+    :param K: glazing extinction coefficient
+    :param L: glazing thickness
+    :type teta: float or np.array
+    :return Ta: transmittance of the glazing
+    :rtype Ta: float or np.array
+
+    :References: Duffie, J. A. and Beckman, W. A. (2013) Radiation Transmission through Glazing: Absorbed Radiation, in
+                 Solar Engineering of Thermal Processes, Fourth Edition, John Wiley & Sons, Inc., Hoboken, NJ, USA.
+                 doi: 10.1002/9781118671603.ch5
+    """
+    teta_r = np.arcsin(np.sin(teta) / n)  # refraction angle in radians(approximation according to Soteris A.) (5.1.4)
+    part1 = teta_r + teta
+    part2 = teta_r - teta
+    Ta = np.exp((-K * L) / np.cos(teta_r)) * (
+            1 - 0.5 * ((np.sin(part2) ** 2) / (np.sin(part1) ** 2) + (np.tan(part2) ** 2) / (np.tan(part1) ** 2)))
+    return Ta
+
+
 def calc_PV_power(absorbed_radiation_Wperm2, T_cell_C, eff_nom, tot_module_area_m2, Bref_perC, misc_losses):
     """
     To calculate the power production of PV panels.
@@ -486,7 +493,7 @@ def optimal_angle_and_tilt(sensors_metadata_clean, latitude, worst_sh, worst_Az,
 
     # calculate the surface area required to install one pv panel on flat roofs with defined tilt angle and array spacing
     surface_area_flat = module_length * (
-            sensors_metadata_clean.array_s / 2 + module_length * [cos(optimal_angle_flat)])
+            sensors_metadata_clean.array_s.to_numpy() / 2 + module_length * cos(optimal_angle_flat))
 
     # calculate the pv module area within the area of each sensor point
     sensors_metadata_clean['area_module'] = np.where(sensors_metadata_clean['tilt'] >= 5,
@@ -495,9 +502,9 @@ def optimal_angle_and_tilt(sensors_metadata_clean, latitude, worst_sh, worst_Az,
                                                              sensors_metadata_clean.AREA_m2 / surface_area_flat))
 
     # categorize the sensors by surface_azimuth, B, GB
-    result = np.vectorize(solar_equations.calc_categoriesroof)(sensors_metadata_clean.surface_azimuth,
-                                                               sensors_metadata_clean.B,
-                                                               sensors_metadata_clean.total_rad_Whm2, Max_Isol)
+    result = solar_equations.calc_categoriesroof(sensors_metadata_clean.surface_azimuth.to_numpy(),
+                                                 sensors_metadata_clean.B.to_numpy(),
+                                                 sensors_metadata_clean.total_rad_Whm2.to_numpy(), Max_Isol)
     sensors_metadata_clean['CATteta_z'] = result[0]
     sensors_metadata_clean['CATB'] = result[1]
     sensors_metadata_clean['CATGB'] = result[2]
@@ -667,9 +674,24 @@ def calc_properties_PV_db(database_path, config):
     :return: dict with Properties of the panel taken form the database
     """
     type_PVpanel = config.solar.type_PVpanel
-    data = pd.read_excel(database_path, sheet_name="PHOTOVOLTAIC_PANELS")
-    panel_properties = data[data['code'] == type_PVpanel].reset_index().T.to_dict()[0]
+    # the database may be edited between runs of the same process, so the cache is keyed by its modification time
+    panel_properties = _read_properties_PV_db(database_path, os.path.getmtime(database_path), type_PVpanel)
+
+    return dict(panel_properties)  # a copy, callers must not modify the cached properties
 
+
+@functools.lru_cache(maxsize=None)
+def _read_properties_PV_db(database_path, database_mtime, type_PVpanel):
+    """
+    Read the properties of one PV panel type from the database, once per process and version of the database file.
+    """
+    data = pd.read_excel(database_path, sheet_name="PHOTOVOLTAIC_PANELS")
+    panel_data = data[data['code'] == type_PVpanel]
+    if panel_data.empty:
+        raise ValueError("Invalid value for variable 'type_PVpanel': {type_PVpanel}, the database {database_path} only "
+                         "has the panel types {codes}".format(type_PVpanel=type_PVpanel, database_path=database_path,
+                                                              codes=', '.join(data['code'].astype(str))))
+    panel_properties = panel_data.reset_index().T.to_dict()[0]
     return panel_properties
 
 
@@ -684,22 +706,21 @@ def calc_Cinv_pv(total_module_area_m2, locator, technology=0):
     PV_cost_data = pd.read_excel(locator.get_database_conversion_systems(), sheet_name="PHOTOVOLTAIC_PANELS")
     technology_code = list(set(PV_cost_data['code']))
     PV_cost_data = PV_cost_data[PV_cost_data['code'] == technology_code[technology]]
-    nominal_efficiency = PV_cost_data[PV_cost_data['code'] == technology_code[technology]]['PV_n'].max()
+    nominal_efficiency = PV_cost_data['PV_n'].max()
     P_nominal_W = total_module_area_m2 * (constants.STC_RADIATION_Wperm2 * nominal_efficiency)
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
     # capacity for the corresponding technology from the database
-    if P_nominal_W < PV_cost_data['cap_min'].values[0]:
-        P_nominal_W = PV_cost_data['cap_min'].values[0]
-    PV_cost_data = PV_cost_data[
-        (PV_cost_data['cap_min'] <= P_nominal_W) & (PV_cost_data['cap_max'] > P_nominal_W)]
-    Inv_a = PV_cost_data.iloc[0]['a']
-    Inv_b = PV_cost_data.iloc[0]['b']
-    Inv_c = PV_cost_data.iloc[0]['c']
-    Inv_d = PV_cost_data.iloc[0]['d']
-    Inv_e = PV_cost_data.iloc[0]['e']
-    Inv_IR = PV_cost_data.iloc[0]['IR_%']
-    Inv_LT = PV_cost_data.iloc[0]['LT_yr']
-    Inv_OM = PV_cost_data.iloc[0]['O&M_%'] / 100
+    P_nominal_W = max(P_nominal_W, PV_cost_data['cap_min'].iloc[0])
+    cost_parameters = PV_cost_data[
+        (PV_cost_data['cap_min'] <= P_nominal_W) & (PV_cost_data['cap_max'] > P_nominal_W)].iloc[0]
+    Inv_a = cost_parameters['a']
+    Inv_b = cost_parameters['b']
+    Inv_c = cost_parameters['c']
+    Inv_d = cost_parameters['d']
+    Inv_e = cost_parameters['e']
+    Inv_IR = cost_parameters['IR_%']
+    Inv_LT = cost_parameters['LT_yr']
+    Inv_OM = cost_parameters['O&M_%'] / 100
 
     InvC = Inv_a + Inv_b * (P_nominal_W) ** Inv_c + (Inv_d + Inv_e * P_nominal_W) * log(P_nominal_W)
 
@@ -711,31 +732,39 @@ def calc_Cinv_pv(total_module_area_m2, locator, technology=0):
 
 
 # remuneration scheme
+# KEV for each nominal capacity of an installation, capacities in ascending order as required by np.interp
+KEV_P_INSTALLED_kW = np.array([0, 9.99, 10, 12, 15, 20, 29, 30, 40, 50, 60, 70, 80, 90, 100, 200, 300, 400, 500, 750,
+                               1000, 1500, 2000, 1000000], dtype=np.float64)
+KEV_REGIME_RpPerkWh = np.array([0, 0, 20.4, 20.4, 20.4, 20.4, 20.4, 20.4, 19.7, 19.3, 19, 18.9, 18.7, 18.6, 18.5, 18.1,
+                                17.9, 17.8, 17.8, 17.7, 17.7, 17.7, 17.6, 17.6], dtype=np.float64)
+# the tables are constants: checked once here, so calc_Crem_pv does not need to validate or sort them per call
+assert len(KEV_P_INSTALLED_kW) == len(KEV_REGIME_RpPerkWh)
+assert np.all(np.diff(KEV_P_INSTALLED_kW) >= 0), 'KEV_P_INSTALLED_kW must be sorted for np.interp'
+KEV_P_INSTALLED_kW.setflags(write=False)
+KEV_REGIME_RpPerkWh.setflags(write=False)
+
+
 def calc_Crem_pv(E_nom):
     """
     Calculates KEV (Kostendeckende Einspeise - Verguetung) for solar PV and PVT.
     Therefore, input the nominal capacity of EACH installation and get the according KEV as return in Rp/kWh
 
-    :param E_nom: Nominal Capacity of solar panels (PV or PVT) [Wh]
-    :type E_nom: float
+    :param E_nom: Nominal Capacity of solar panels (PV or PVT) [Wh], one value or one value per installation
+    :type E_nom: float or np.array
     :return KEV_obtained_in_RpPerkWh: KEV remuneration [Rp/kWh]
-    :rtype KEV_obtained_in_RpPerkWh: float
+    :rtype KEV_obtained_in_RpPerkWh: float or np.array
     """
     # TODO: change input argument to area_installed and then calculate the nominal capacity within this function, see calc_Cinv_pv
-    KEV_regime = [0, 0, 20.4, 20.4, 20.4, 20.4, 20.4, 20.4, 19.7, 19.3, 19, 18.9, 18.7, 18.6, 18.5, 18.1, 17.9, 17.8,
-                  17.8, 17.7, 17.7, 17.7, 17.6, 17.6]
-    P_installed_in_kW = [0, 9.99, 10, 12, 15, 20, 29, 30, 40, 50, 60, 70, 80, 90, 100, 200, 300, 400, 500, 750, 1000,
-                         1500, 2000, 1000000]
-    KEV_interpolated_kW = interpolate.interp1d(P_installed_in_kW, KEV_regime, kind="linear")
-    KEV_obtained_in_RpPerkWh = 0
-    if (E_nom / 1000) > P_installed_in_kW[-1]:
-        number_of_installations = int(ceil(E_nom / P_installed_in_kW[-1]))
-        E_nom_per_chiller = E_nom / number_of_installations
-        for i in range(number_of_installations):
-            KEV_obtained_in_RpPerkWh = KEV_obtained_in_RpPerkWh + KEV_interpolated_kW(E_nom_per_chiller / 1000.0)
-    else:
-        KEV_obtained_in_RpPerkWh = KEV_obtained_in_RpPerkWh + KEV_interpolated_kW(E_nom / 1000.0)
-    return KEV_obtained_in_RpPerkWh
+    E_nom = np.asarray(E_nom, dtype=np.float64)
+    if np.any(E_nom < 0):
+        raise ValueError('The nominal capacity of a solar installation cannot be negative: {E_nom}'.format(E_nom=E_nom))
+    # capacities beyond the table are split in installations of the same size, so they all obtain the same KEV
+    number_of_installations = np.where(E_nom / 1000 > KEV_P_INSTALLED_kW[-1], np.ceil(E_nom / KEV_P_INSTALLED_kW[-1]),
+                                       1)
+    E_nom_per_chiller = E_nom / number_of_installations
+    KEV_obtained_in_RpPerkWh = number_of_installations * np.interp(E_nom_per_chiller / 1000.0, KEV_P_INSTALLED_kW,
+                                                                   KEV_REGIME_RpPerkWh)
+    return KEV_obtained_in_RpPerkWh[()]  # a float for a single capacity
 
 
 def aggregate_results(locator, building_names):
@@ -811,14 +840,21 @@ def main(config):
     weather_data = epwreader.epw_reader(locator.get_weather_file())
     date_local = solar_equations.calc_datetime_local_from_weather_file(weather_data, latitude, longitude)
 
+    # solar properties and panel properties are the same for all buildings
+    solar_properties = solar_equations.calc_sun_properties(latitude, longitude, weather_data, date_local, config)
+    print('calculating solar properties done')
+    panel_properties_PV = calc_properties_PV_db(locator.get_database_conversion_systems(), config)
+    print('gathering properties of PV panel')
+
     num_process = config.get_number_of_processes()
     n = len(building_names)
     cea.utilities.parallel.vectorize(calc_PV, num_process)(repeat(locator, n),
                                                            repeat(config, n),
                                                            repeat(latitude, n),
-                                                           repeat(longitude, n),
                                                            repeat(weather_data, n),
                                                            repeat(date_local, n),
+                                                           repeat(solar_properties, n),
+                                                           repeat(panel_properties_PV, n),
                                                            building_names)
 
     # aggregate results from all buildings
@@ -178,7 +178,7 @@ def calc_PVT_generation(sensor_groups, weather_data, date_local, solar_propertie
     lat_rad = radians(latitude)
     g_rad = np.radians(solar_properties.g)
     ha_rad = np.radians(solar_properties.ha)
-    Sz_rad = np.radians(solar_properties.Sz)
+    Sz_rad = np.radians(solar_properties.Sz.to_numpy())
 
     # calculate equivalent length of pipes
     total_area_module_m2 = prop_observers['area_installed_module_m2'].sum()  # total area for panel installation
@@ -228,11 +228,11 @@ def calc_PVT_generation(sensor_groups, weather_data, date_local, solar_propertie
         teta_ed_rad, teta_eg_rad = calc_diffuseground_comp(tilt_rad)
 
         # absorbed radiation and Tcell
-        absorbed_radiation_PV_Wperm2 = np.vectorize(calc_absorbed_radiation_PV)(radiation_Wperm2.I_sol,
-                                                                                radiation_Wperm2.I_direct,
-                                                                                radiation_Wperm2.I_diffuse, tilt_rad,
-                                                                                Sz_rad, teta_rad, teta_ed_rad,
-                                                                                teta_eg_rad, panel_properties_PV)
+        absorbed_radiation_PV_Wperm2 = calc_absorbed_radiation_PV(radiation_Wperm2.I_sol.to_numpy(),
+                                                                  radiation_Wperm2.I_direct.to_numpy(),
+                                                                  radiation_Wperm2.I_diffuse.to_numpy(), tilt_rad,
+                                                                  Sz_rad, teta_rad, teta_ed_rad, teta_eg_rad,
+                                                                  panel_properties_PV)
 
         T_cell_C = np.vectorize(calc_cell_temperature)(absorbed_radiation_PV_Wperm2, weather_data.drybulb_C,
                                                        panel_properties_PV)
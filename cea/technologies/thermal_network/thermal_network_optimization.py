@@ -204,7 +204,7 @@ def output_results_of_all_individuals(config, locator, network_info):
     for individual in network_info.populations.keys():
         # read results from each individual
         individual_df = pd.read_csv(network_info.locate_individual_results(individual), index_col=None, header=0)
-        all_individuals_list.append(individual_df.as_matrix())
+        all_individuals_list.append(individual_df.to_numpy())
     all_individuals_array = np.vstack(all_individuals_list)
     all_individuals_df = pd.DataFrame(all_individuals_array).drop(columns=[0])
     all_individuals_df.columns = network_info.generation_info + network_info.cost_info
@@ -71,7 +71,7 @@ class TestCalcThermalLoads(unittest.TestCase):
         self.assertIsNone(result)
         self.assertTrue(os.path.exists(self.locator.get_demand_results_file('B1011')),
                         'Building csv not produced')
-        self.assertTrue(os.path.exists(self.locator.get_temporary_file('B1011T.csv')),
+        self.assertTrue(os.path.exists(self.locator.get_temporary_file('B1011T.feather')),
                         'Building temp file not produced')
 
         # test the building csv file (output of the `calc_thermal_loads` call above)
@@ -0,0 +1,42 @@
+"""
+Test cea.technologies.solar.photovoltaic
+"""
+
+import unittest
+import numpy as np
+from cea.technologies.solar.photovoltaic import calc_Crem_pv
+
+
+class TestCalcCremPv(unittest.TestCase):
+    # nominal capacity [Wh] -> KEV [Rp/kWh], the values returned before calc_Crem_pv was vectorized
+    expected_KEV = {
+        0.0: 0.0,
+        5000.0: 0.0,  # below 9.99 kW there is no KEV
+        9995.0: 10.2,  # halfway the step from 9.99 kW to 10 kW
+        10000.0: 20.4,
+        35000.0: 20.05,
+        150000.0: 18.3,
+        2000000.0: 17.6,
+        1e9: 17.6,  # the largest capacity of the table
+        2e9: 2000 * 17.7,  # split in 2000 installations of 1000 kW each
+    }
+
+    def test_scalar(self):
+        for E_nom, KEV in self.expected_KEV.items():
+            result = calc_Crem_pv(E_nom)
+            self.assertIsInstance(result, float)
+            self.assertAlmostEqual(result, KEV, places=6, msg='E_nom = {E_nom}'.format(E_nom=E_nom))
+
+    def test_array(self):
+        E_nom = np.array(list(self.expected_KEV.keys()))
+        np.testing.assert_allclose(calc_Crem_pv(E_nom), list(self.expected_KEV.values()), atol=1e-6)
+
+    def test_negative_capacity(self):
+        with self.assertRaises(ValueError):
+            calc_Crem_pv(-1000.0)
+        with self.assertRaises(ValueError):
+            calc_Crem_pv(np.array([1000.0, -1000.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Test cea.utilities.solar_equations
+"""
+
+import unittest
+import numpy as np
+from cea.utilities.solar_equations import calc_categoriesroof
+
+
+class TestCalcCategoriesroof(unittest.TestCase):
+    """The categories of the values at and next to the bin edges, as the scalar comparisons used to assign them"""
+    Max_Isol = 1000.0
+
+    def categorize(self, teta_z=None, B_deg=None, GB=None):
+        """categorize one of the three inputs, using values in range for the other two"""
+        n = len(next(values for values in (teta_z, B_deg, GB) if values is not None))
+        teta_z = np.full(n, 0.0) if teta_z is None else np.array(teta_z, dtype=float)
+        B = np.radians(np.full(n, 30.0) if B_deg is None else np.array(B_deg, dtype=float))
+        GB = np.full(n, 500.0) if GB is None else np.array(GB, dtype=float)
+        return calc_categoriesroof(teta_z, B, GB, self.Max_Isol)
+
+    def test_surface_azimuth(self):
+        teta_z = [-180, -122.5, -122.4, -67, -66.9, -22.5, -22.4, 22.5, 22.6, 67, 67.1, 122.5, 122.6, 180]
+        expected = [6, 6, 1, 1, 3, 3, 5, 5, 4, 4, 2, 2, 6, 6]
+        CATteta_z, _, _ = self.categorize(teta_z=teta_z)
+        np.testing.assert_array_equal(CATteta_z, expected)
+
+    def test_tilt_angle(self):
+        B_deg = [-1, 0, 0.1, 5, 5.1, 15, 15.1, 25, 25.1, 40, 40.1, 60, 60.1, 90]
+        expected = [np.nan, np.nan, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6]
+        _, CATB, _ = self.categorize(B_deg=B_deg)
+        np.testing.assert_array_equal(CATB, expected)
+
+    def test_yearly_radiation(self):
+        GB = [-5, 0, 0.1, 100, 100.1, 200, 300, 400, 500, 600, 700, 800, 900, 900.1, 1000, 1000.1]
+        expected = [np.nan, np.nan, 1, 1, 2, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, np.nan]
+        _, _, CATGB = self.categorize(GB=GB)
+        np.testing.assert_array_equal(CATGB, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
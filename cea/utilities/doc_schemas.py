@@ -9,6 +9,8 @@ NOTE: This is meant to help _write_ the schemas.yml file, not to CREATE it - you
 
 
 
+import copy
+import functools
 import os
 import yaml
 import json
@@ -30,6 +32,9 @@ __maintainer__ = "Daren Thomas"
 __email__ = "cea@arch.ethz.ch"
 __status__ = "Production"
 
+# number of rows read to infer the schema of a csv file or shapefile
+SCHEMA_SAMPLE_ROWS = 1024
+
 
 def read_schema(scenario, locator_method, args=None):
     if not args:
@@ -37,7 +42,7 @@ def read_schema(scenario, locator_method, args=None):
     abs_path = read_path(args, locator_method, scenario)
     file_type = read_file_type(abs_path)
 
-    buildings = cea.inputlocator.InputLocator(scenario).get_zone_building_names()
+    buildings = get_zone_building_names(scenario)
 
     return {
         locator_method: {
@@ -48,13 +53,45 @@ def read_schema(scenario, locator_method, args=None):
     }
 
 
+@functools.lru_cache(maxsize=4)
+def _get_locator(scenario):
+    return cea.inputlocator.InputLocator(scenario=scenario)
+
+
+def get_zone_building_names(scenario):
+    """
+    Returns the zone building names of the scenario, reading the zone geometry only when it changed since the last call
+    """
+    zone_geometry = _get_locator(scenario).get_zone_geometry()
+    zone_geometry_mtime = os.path.getmtime(zone_geometry) if os.path.exists(zone_geometry) else None
+    return _read_zone_building_names(scenario, zone_geometry_mtime)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_zone_building_names(scenario, zone_geometry_mtime):
+    # zone_geometry_mtime is only part of the cache key
+    return tuple(_get_locator(scenario).get_zone_building_names())
+
+
 def read_schema_details(abs_path, file_type, buildings):
     """
-    Returns schema as a dict, based on file_type
+    Returns schema as a dict, based on file_type. Schemas are cached in memory until the file changes.
 
     :return: schema of each file. E.g., schema = {columns : {Hs_ag: {...}, Hs_bg: {...}, ...}
     :rtype: dict
     """
+    abs_path = os.path.abspath(abs_path)
+    # the columns of a shapefile are stored in its .dbf file
+    files_read = [abs_path, os.path.splitext(abs_path)[0] + '.dbf'] if file_type == 'shp' else [abs_path]
+    files_signature = tuple((os.path.getmtime(f), os.path.getsize(f)) for f in files_read if os.path.exists(f))
+    schema = _read_schema_details(abs_path, file_type, tuple(buildings), files_signature)
+    # callers are free to edit the schema they get, the cached one has to stay intact
+    return copy.deepcopy(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_schema_details(abs_path, file_type, buildings, files_signature):
+    # files_signature is only part of the cache key
     schema_readers = {
         "xls": get_xls_schema,
         "xlsx": get_xls_schema,
@@ -67,6 +104,8 @@ def read_schema_details(abs_path, file_type, buildings):
         "shp": get_shp_schema,
         "html": get_html_schema,
     }
+    # keeps the order of the buildings (see replace_repetitive_column_names) with constant-time membership tests
+    buildings = dict.fromkeys(buildings)
     return schema_readers[file_type](abs_path, buildings)
 
 
@@ -80,8 +119,7 @@ def read_file_type(abs_path):
 
 def read_path(args, locator_method, scenario):
     """Returns the path, as returned by the locator method"""
-    locator = cea.inputlocator.InputLocator(scenario=scenario)
-    method = getattr(locator, locator_method)
+    method = getattr(_get_locator(scenario), locator_method)
     path = method(**args)
     return path
 
@@ -100,7 +138,7 @@ def read_file_path(abs_path, scenario, args):
 
 def get_csv_schema(filename, buildings):
     try:
-        df = pd.read_csv(filename)
+        df = read_csv_sample(filename)
     except EmptyDataError:
         # csv file is empty
         return None
@@ -111,20 +149,32 @@ def get_csv_schema(filename, buildings):
     return schema
 
 
+def read_csv_sample(filename, **kwargs):
+    """
+    Returns the first SCHEMA_SAMPLE_ROWS rows of a csv file - or the whole file if the sample leaves a column without
+    any value to infer its type from. kwargs are passed on to ``pd.read_csv``.
+    """
+    df = pd.read_csv(filename, nrows=SCHEMA_SAMPLE_ROWS, **kwargs)
+    if len(df) == SCHEMA_SAMPLE_ROWS and df.isna().all().any():
+        df = pd.read_csv(filename, **kwargs)
+    return df
+
+
 def replace_repetitive_column_names(column_name, buildings):
     """
     Returns column_name _unless_ it's one of a few special cases (building names, PIPE names, NODE names, srf names)
     :param str column_name: the name of the column
+    :param buildings: the building names of the zone, in order
     :return: column_name or similar (for repetitive column names)
     """
     if column_name.startswith('srf'):
-        column_name = "srf0"
+        return "srf0"
     if column_name.startswith('PIPE'):
-        column_name = "PIPE0"
+        return "PIPE0"
     if column_name.startswith('NODE'):
-        column_name = "NODE0"
+        return "NODE0"
     if column_name in buildings:
-        column_name = buildings[0]
+        return next(iter(buildings))
     return column_name
 
 
@@ -136,7 +186,7 @@ def get_json_schema(filename, buildings):
             df = pd.DataFrame(json_file)
             for column_name in df.columns:
                 column_name = replace_repetitive_column_names(column_name, buildings)
-                schema[column_name.encode('ascii', 'ignore')] = get_column_schema(df[column_name])
+                schema[column_name] = get_column_schema(df[column_name])
         except Exception:
             # in case json file has an odd shape, get a simplified schema
             for key in json_file.keys():
@@ -167,7 +217,11 @@ def get_epw_schema(filename, _):
                   'liq_precip_depth_mm (index = 33)',
                   'liq_precip_rate_Hour (index = 34)']
 
-    db = pd.read_csv(filename, skiprows=8, header=None, names=epw_labels)
+    # the types of the date fields and of the data source flags are fixed by the EPW format, so pandas does not need
+    # to infer them. The other fields are inferred, as files differ in whether they hold integers or decimals
+    epw_dtypes = {label: 'int64' for label in epw_labels[:5]}
+    epw_dtypes['datasource (index = 5)'] = str
+    db = read_csv_sample(filename, skiprows=8, header=None, names=epw_labels, dtype=epw_dtypes)
     schema = {}
     for attr in db:
         schema[attr] = get_column_schema(db[attr])
@@ -191,7 +245,10 @@ def extract_df_schema(df, scenario):
 
 
 def get_shp_schema(filename, scenario):
-    df = geopandas.read_file(filename)
+    # like read_csv_sample: only the first rows, unless a column has no values in them
+    df = geopandas.read_file(filename, rows=SCHEMA_SAMPLE_ROWS)
+    if len(df) == SCHEMA_SAMPLE_ROWS and df.isna().all().any():
+        df = geopandas.read_file(filename)
     return extract_df_schema(df, scenario)
 
 
@@ -201,18 +258,11 @@ def get_xls_schema(filename, _):
     for sheet in sheets.keys():
         sheet_schema = {"columns": {}}
         sheet_df = sheets[sheet]
-        # if xls seems to have row attributes
-        if 'Unnamed: 1' in sheets[sheet].keys():
-            sheet_df = sheet_df.T
-            # filter the nans
-            new_columns = []
-            for column_name in sheet_df.columns:
-                if column_name:
-                    new_columns.append(column_name)
-            # change index to numbered
-            sheet_df.index = range(len(sheet_df))
-            # select only non-nan columns
-            sheet_df = sheet_df[new_columns]
+        # if xls seems to have row attributes, the first column holds their names
+        if 'Unnamed: 1' in sheet_df.columns:
+            sheet_df = sheet_df.set_index(sheet_df.columns[0]).T.reset_index(drop=True)
+            # drop the rows without an attribute name
+            sheet_df = sheet_df.loc[:, sheet_df.columns.notna()]
         for column_name in sheet_df.columns:
             sheet_schema["columns"][column_name] = get_column_schema(sheet_df[column_name])
         schema[sheet] = sheet_schema
@@ -242,19 +292,24 @@ def get_column_schema(df_series):
     """
     types_found = set()
     column_schema = {}
-    for value in df_series:
-        if value == value:
-            column_schema['sample_data'] = value
-            if is_date(value):
-                types_found.add('date')
-            elif isinstance(value, str):
-                # column_schema['sample_data'] = value.encode('ascii', 'ignore') # TODO: remove if not use
-                types_found.add('string')
-            else:
-                types_found.add(type(value).__name__)
-        # declare nans
-        if value != value:
-            types_found.add(None)
+    valid_values = df_series.dropna()
+    if len(valid_values):
+        # tolist() returns python scalars, like iterating over the series does
+        column_schema['sample_data'] = valid_values.iloc[-1:].tolist()[0]
+        if df_series.dtype.kind == 'O':
+            is_string = valid_values.map(lambda value: isinstance(value, str))
+            types_found.update(value_type.__name__ for value_type in valid_values[~is_string].map(type).unique())
+            # each distinct string is parsed once, until both kinds are found
+            for value in valid_values[is_string].unique():
+                types_found.add('date' if is_date(value) else 'string')
+                if {'date', 'string'} <= types_found:
+                    break
+        else:
+            # all values of a column with a numpy dtype have the same python type
+            types_found.add(type(column_schema['sample_data']).__name__)
+    # declare nans
+    if len(valid_values) < len(df_series):
+        types_found.add(None)
     column_schema['types_found'] = list(types_found)
     column_schema["pandas"] = {
         "type": df_series.dtype.name,
@@ -286,7 +341,6 @@ def is_date(value):
         return False
 
 
-
 def main(config):
     """
     Read the schema entry for a locator method, compare it to the current entry and print out a new, updated version.
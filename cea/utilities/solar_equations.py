@@ -10,7 +10,7 @@ import pandas as pd
 import ephem
 import datetime
 import collections
-from math import radians, degrees, asin, sin, acos, cos, tan, atan, pi
+from math import radians, degrees, sin, acos, cos, tan, atan, pi
 
 from pyarrow import feather
 from timezonefinder import TimezoneFinder
@@ -132,15 +132,15 @@ def get_local_etc_timezone(latitude, longitude):
 
 def calc_sun_properties(latitude, longitude, weather_data, datetime_local, config):
     solar_window_solstice = config.solar.solar_window_solstice
-    hour_date = datetime_local.hour
-    min_date = datetime_local.minute
-    day_date = datetime_local.dayofyear
+    hour_date = datetime_local.hour.to_numpy()
+    min_date = datetime_local.minute.to_numpy()
+    day_date = datetime_local.dayofyear.to_numpy()
     worst_hour = calc_worst_hour(latitude, weather_data, solar_window_solstice)
 
     # solar elevation, azimuth and values for the 9-3pm period of no shading on the solar solstice
     sun_coords = pyephem(datetime_local, latitude, longitude)
-    sun_coords['declination'] = np.vectorize(declination_degree)(day_date, 365)
-    sun_coords['hour_angle'] = np.vectorize(get_hour_angle)(longitude, min_date, hour_date, day_date)
+    sun_coords['declination'] = declination_degree(day_date, 365)
+    sun_coords['hour_angle'] = get_hour_angle(longitude, min_date, hour_date, day_date)
     worst_sh = sun_coords['elevation'].loc[datetime_local[worst_hour]]
     worst_Az = sun_coords['azimuth'].loc[datetime_local[worst_hour]]
 
@@ -176,7 +176,7 @@ def declination_degree(day_date, TY):
     .. [1] http://pysolar.org/
     """
 
-    return 23.45 * np.vectorize(sin)((2 * pi / (TY)) * (day_date - 81))
+    return 23.45 * np.sin((2 * pi / (TY)) * (day_date - 81))
 
 
 def get_hour_angle(longitude_deg, min_date, hour_date, day_date):
@@ -200,7 +200,8 @@ def get_solar_time(longitude_deg, min_date, hour_date, day_date):
 
 def get_equation_of_time(day_date):
     B = (day_date - 1) * 360 / 365
-    E = 229.2 * (0.000075 + 0.001868 * cos(B) - 0.032077 * sin(B) - 0.014615 * cos(2 * B) - 0.04089 * sin(2 * B))
+    E = 229.2 * (0.000075 + 0.001868 * np.cos(B) - 0.032077 * np.sin(B) - 0.014615 * np.cos(2 * B) -
+                 0.04089 * np.sin(2 * B))
     return E
 
 
@@ -222,7 +223,7 @@ def filter_low_potential(radiation_sensor_path, metadata_csv_path, config):
     :rtype max_annual_radiation: float
     :return annual_radiation_threshold: minimum yearly radiation threshold for sensor selection [Wh/m2/year]
     :rtype annual_radiation_threshold: float
-    :return sensors_rad_clean: radiation data of the filtered sensors [Wh/m2]
+    :return sensors_rad_clean: radiation data of the filtered sensors [Wh/m2], in single precision
     :rtype sensors_rad_clean: dataframe
     :return sensors_metadata_clean: data of filtered sensor points measuring solar insulation of each building
     :rtype sensors_metadata_clean: dataframe
@@ -235,12 +236,6 @@ def filter_low_potential(radiation_sensor_path, metadata_csv_path, config):
     #. No solar panels on windows.
     """
 
-    def f(x):
-        if x <= 50:
-            return 0
-        else:
-            return x
-
     # read radiation file
     sensors_rad = feather.read_feather(radiation_sensor_path)
     sensors_metadata = pd.read_csv(metadata_csv_path)
@@ -250,24 +245,25 @@ def filter_low_potential(radiation_sensor_path, metadata_csv_path, config):
     sensors_metadata.set_index('SURFACE', inplace=True)
     sensors_metadata = sensors_metadata.merge(sensors_rad_sum, left_index=True, right_index=True)  # [Wh/m2]
 
-    # remove window surfaces
-    sensors_metadata = sensors_metadata[sensors_metadata.TYPE != 'windows']
-
-    # keep sensors if allow pv installation on walls or on roofs
+    # remove window surfaces, keep sensors if allow pv installation on walls or on roofs
+    excluded_types = ['windows']
     if config.solar.panel_on_roof is False:
-        sensors_metadata = sensors_metadata[sensors_metadata.TYPE != 'roofs']
+        excluded_types.append('roofs')
     if config.solar.panel_on_wall is False:
-        sensors_metadata = sensors_metadata[sensors_metadata.TYPE != 'walls']
-
+        excluded_types.append('walls')
+    sensors_metadata = sensors_metadata[~sensors_metadata.TYPE.isin(excluded_types)]
 
     # set min yearly radiation threshold for sensor selection
     # keep sensors above min production in sensors_rad
-    max_annual_radiation = sensors_rad_sum.max().values[0]
+    max_annual_radiation = sensors_rad_sum['total_rad_Whm2'].max()
     annual_radiation_threshold_Whperm2 = float(config.solar.annual_radiation_threshold)*1000
     sensors_metadata_clean = sensors_metadata[sensors_metadata.total_rad_Whm2 >= annual_radiation_threshold_Whperm2]
-    sensors_rad_clean = sensors_rad[sensors_metadata_clean.index.tolist()]  # keep sensors above min radiation
-
-    sensors_rad_clean = sensors_rad_clean.applymap(lambda x: f(x))
+    # keep sensors above min radiation, eliminate hours with radiation <= 50 W/m2
+    # single precision is enough for the hourly values of the sensors, the group means are upcast in calc_groups
+    surfaces_clean = sensors_metadata_clean.index.tolist()
+    radiation_clean = sensors_rad[surfaces_clean].to_numpy(dtype=np.float32, copy=True)
+    np.putmask(radiation_clean, radiation_clean <= 50, 0)
+    sensors_rad_clean = pd.DataFrame(radiation_clean, index=sensors_rad.index, columns=surfaces_clean)
 
     return max_annual_radiation, annual_radiation_threshold_Whperm2, sensors_rad_clean, sensors_metadata_clean
 
@@ -314,39 +310,39 @@ def calc_spacing_custom_angle(sensors_metadata_clean, solar_properties, max_rad_
 
     # calculate panel tilt angle (B) for flat roofs (tilt < 5 degrees), slope roofs and walls.
     input_angle_rad = radians(panel_tilt_angle)
-    sensors_metadata_clean['tilt_deg'] = np.vectorize(acos)(sensors_metadata_clean['Zdir'])  # surface tilt angle in rad
-    sensors_metadata_clean['tilt_deg'] = np.vectorize(degrees)(sensors_metadata_clean['tilt_deg'])  # surface tilt angle in degrees
-    sensors_metadata_clean['B_deg'] = np.where(sensors_metadata_clean['tilt_deg'] >= 5,
-                                               sensors_metadata_clean['tilt_deg'],
-                                               degrees(input_angle_rad))  # panel tilt angle in degrees
+    tilt_deg = np.degrees(np.arccos(sensors_metadata_clean['Zdir'].to_numpy()))  # surface tilt angle in degrees
+    is_tilted = tilt_deg >= 5  # sensors on walls and slope roofs
+    B_deg = np.where(is_tilted, tilt_deg, degrees(input_angle_rad))  # panel tilt angle in degrees
 
     # calculate spacing and surface azimuth of the panels for flat roofs
     module_length_m = panel_properties['module_length_m']
     optimal_spacing_flat_m = calc_optimal_spacing(solar_properties, input_angle_rad, module_length_m)
-    sensors_metadata_clean['array_spacing_m'] = np.where(sensors_metadata_clean['tilt_deg'] >= 5, 0,
-                                                         optimal_spacing_flat_m)
-    sensors_metadata_clean['surface_azimuth_deg'] = np.vectorize(calc_surface_azimuth)(sensors_metadata_clean['Xdir'],
-                                                                                       sensors_metadata_clean['Ydir'],
-                                                                                       sensors_metadata_clean[
-                                                                                           'B_deg'])  # degrees
+    array_spacing_m = np.where(is_tilted, 0, optimal_spacing_flat_m)
+    surface_azimuth_deg = calc_surface_azimuth(sensors_metadata_clean['Xdir'].to_numpy(),
+                                               sensors_metadata_clean['Ydir'].to_numpy(), B_deg)
 
     # calculate the surface area required to install one pv panel on flat roofs with defined tilt angle and array spacing
     if panel_properties['type'] == 'PV':
         module_width_m = module_length_m  # for PV
     else:
         module_width_m = panel_properties['module_area_m2'] / module_length_m  # for FP, ET
-    module_flat_surface_area_m2 = module_width_m * (sensors_metadata_clean.array_spacing_m / 2 +
-                                                    module_length_m * cos(input_angle_rad))
+    module_flat_surface_area_m2 = module_width_m * (array_spacing_m / 2 + module_length_m * cos(input_angle_rad))
     area_per_module_m2 = module_width_m * module_length_m
 
     # calculate the pv/solar collector module area within the area of each sensor point
-    sensors_metadata_clean['area_installed_module_m2'] = np.where(
-        sensors_metadata_clean['tilt_deg'] >= 5, sensors_metadata_clean.AREA_m2,
-        area_per_module_m2 * (roof_coverage * sensors_metadata_clean.AREA_m2 / module_flat_surface_area_m2))
+    area_m2 = sensors_metadata_clean['AREA_m2'].to_numpy()
+    area_installed_module_m2 = np.where(is_tilted, area_m2,
+                                        area_per_module_m2 * (roof_coverage * area_m2 / module_flat_surface_area_m2))
 
     # categorize the sensors by surface_azimuth, B, GB
-    result = np.vectorize(calc_categoriesroof)(sensors_metadata_clean.surface_azimuth_deg, sensors_metadata_clean.B_deg,
-                                               sensors_metadata_clean.total_rad_Whm2, max_rad_Whperm2yr)
+    result = calc_categoriesroof(surface_azimuth_deg, B_deg, sensors_metadata_clean['total_rad_Whm2'].to_numpy(),
+                                 max_rad_Whperm2yr)
+
+    sensors_metadata_clean['tilt_deg'] = tilt_deg
+    sensors_metadata_clean['B_deg'] = B_deg
+    sensors_metadata_clean['array_spacing_m'] = array_spacing_m
+    sensors_metadata_clean['surface_azimuth_deg'] = surface_azimuth_deg
+    sensors_metadata_clean['area_installed_module_m2'] = area_installed_module_m2
     sensors_metadata_clean['CATteta_z'] = result[0]
     sensors_metadata_clean['CATB'] = result[1]
     sensors_metadata_clean['CATGB'] = result[2]
@@ -396,42 +392,40 @@ def optimal_angle_and_tilt(sensors_metadata_clean, latitude, solar_properties, m
     # calculate panel tilt angle (B) for flat roofs (tilt < 5 degrees), slope roofs and walls.
     optimal_angle_flat_rad = calc_optimal_angle(180, latitude,
                                                 solar_properties.trr_mean)  # assume surface azimuth = 180 (N,E), south facing
-    sensors_metadata_clean['tilt_deg'] = np.vectorize(acos)(sensors_metadata_clean['Zdir'])  # surface tilt angle in rad
-    sensors_metadata_clean['tilt_deg'] = np.vectorize(degrees)(
-        sensors_metadata_clean['tilt_deg'])  # surface tilt angle in degrees
-    sensors_metadata_clean['B_deg'] = np.where(sensors_metadata_clean['tilt_deg'] >= 5,
-                                               sensors_metadata_clean['tilt_deg'],
-                                               degrees(optimal_angle_flat_rad))  # panel tilt angle in degrees
+    tilt_deg = np.degrees(np.arccos(sensors_metadata_clean['Zdir'].to_numpy()))  # surface tilt angle in degrees
+    is_tilted = tilt_deg >= 5  # sensors on walls and slope roofs
+    B_deg = np.where(is_tilted, tilt_deg, degrees(optimal_angle_flat_rad))  # panel tilt angle in degrees
 
     # calculate spacing and surface azimuth of the panels for flat roofs
     module_length_m = panel_properties['module_length_m']
     optimal_spacing_flat_m = calc_optimal_spacing(solar_properties, optimal_angle_flat_rad, module_length_m)
-    sensors_metadata_clean['array_spacing_m'] = np.where(sensors_metadata_clean['tilt_deg'] >= 5, 0,
-                                                         optimal_spacing_flat_m)
-    sensors_metadata_clean['surface_azimuth_deg'] = np.vectorize(calc_surface_azimuth)(sensors_metadata_clean['Xdir'],
-                                                                                       sensors_metadata_clean['Ydir'],
-                                                                                       sensors_metadata_clean[
-                                                                                           'B_deg'])  # degrees
+    array_spacing_m = np.where(is_tilted, 0, optimal_spacing_flat_m)
+    surface_azimuth_deg = calc_surface_azimuth(sensors_metadata_clean['Xdir'].to_numpy(),
+                                               sensors_metadata_clean['Ydir'].to_numpy(), B_deg)
 
     # calculate the surface area required to install one pv panel on flat roofs with defined tilt angle and array spacing
     if panel_properties['type'] == 'PV':
         module_width_m = module_length_m  # for PV
     else:
         module_width_m = panel_properties['module_area_m2'] / module_length_m  # for FP, ET
-    module_flat_surface_area_m2 = module_width_m * (sensors_metadata_clean.array_spacing_m / 2 +
+    module_flat_surface_area_m2 = module_width_m * (array_spacing_m / 2 +
                                                     module_length_m * cos(optimal_angle_flat_rad))
     area_per_module_m2 = module_width_m * module_length_m
 
     # calculate the pv/solar collector module area within the area of each sensor point
-    sensors_metadata_clean['area_installed_module_m2'] = np.where(sensors_metadata_clean['tilt_deg'] >= 5,
-                                                                  sensors_metadata_clean.AREA_m2,
-                                                                  roof_coverage * area_per_module_m2 *
-                                                                  (sensors_metadata_clean.AREA_m2 /
-                                                                   module_flat_surface_area_m2))
+    area_m2 = sensors_metadata_clean['AREA_m2'].to_numpy()
+    area_installed_module_m2 = np.where(is_tilted, area_m2,
+                                        roof_coverage * area_per_module_m2 * (area_m2 / module_flat_surface_area_m2))
 
     # categorize the sensors by surface_azimuth, B, GB
-    result = np.vectorize(calc_categoriesroof)(sensors_metadata_clean.surface_azimuth_deg, sensors_metadata_clean.B_deg,
-                                               sensors_metadata_clean.total_rad_Whm2, max_rad_Whperm2yr)
+    result = calc_categoriesroof(surface_azimuth_deg, B_deg, sensors_metadata_clean['total_rad_Whm2'].to_numpy(),
+                                 max_rad_Whperm2yr)
+
+    sensors_metadata_clean['tilt_deg'] = tilt_deg
+    sensors_metadata_clean['B_deg'] = B_deg
+    sensors_metadata_clean['array_spacing_m'] = array_spacing_m
+    sensors_metadata_clean['surface_azimuth_deg'] = surface_azimuth_deg
+    sensors_metadata_clean['area_installed_module_m2'] = area_installed_module_m2
     sensors_metadata_clean['CATteta_z'] = result[0]
     sensors_metadata_clean['CATB'] = result[1]
     sensors_metadata_clean['CATGB'] = result[2]
@@ -490,127 +484,58 @@ def calc_optimal_spacing(sun_properties, tilt_angle, module_length):
     return D
 
 
+# bin edges of the sensor categories, all intervals are closed on the right
+CATTETA_Z_BINS = np.array([-122.5, -67, -22.5, 22.5, 67, 122.5])  # surface azimuth [degree]
+CATTETA_Z_OF_BIN = np.array([6, 1, 3, 5, 4, 2, 6])  # category of each surface azimuth bin, 6 outside of +/-122.5
+CATB_BINS = np.array([0, 5, 15, 25, 40, 60])  # tilt angle [degree]
+CATGB_BINS = np.array([0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1])  # share of the maximum yearly radiation
+
+
 def calc_categoriesroof(teta_z, B, GB, Max_Isol):
     """
     To categorize solar panels by the surface azimuth, tilt angle and yearly radiation.
 
     :param teta_z: surface azimuth [degree], 0 degree north (east positive, west negative)
-    :type teta_z: float
+    :type teta_z: np.array
     :param B: solar panel tile angle [degree]
-    :type B: float
+    :type B: np.array
     :param GB: yearly radiation of sensors [Wh/m2/year]
-    :type GB: float
+    :type GB: np.array
     :param Max_Isol: maximum radiation received on surfaces [Wh/m2/year]
     :type Max_Isol: float
     :return CATteta_z: category of surface azimuth
-    :rtype CATteta_z: float
-    :return CATB: category of tilt angle
-    :rtype CATB: float
-    :return CATBG: category of yearly radiation
-    :rtype CATBG: float
+    :rtype CATteta_z: np.array
+    :return CATB: category of tilt angle, nan if out of range
+    :rtype CATB: np.array
+    :return CATBG: category of yearly radiation, nan if out of range
+    :rtype CATBG: np.array
     """
-    if -122.5 < teta_z <= -67:
-        CATteta_z = 1
-    elif -67 < teta_z <= -22.5:
-        CATteta_z = 3
-    elif -22.5 < teta_z <= 22.5:
-        CATteta_z = 5
-    elif 22.5 < teta_z <= 67:
-        CATteta_z = 4
-    elif 67 <= teta_z <= 122.5:
-        CATteta_z = 2
-    else:
-        CATteta_z = 6
-    B = degrees(B)
-    if 0 < B <= 5:
-        CATB = 1  # flat roof
-    elif 5 < B <= 15:
-        CATB = 2  # tilted 5-15 degrees
-    elif 15 < B <= 25:
-        CATB = 3  # tilted 15-25 degrees
-    elif 25 < B <= 40:
-        CATB = 4  # tilted 25-40 degrees
-    elif 40 < B <= 60:
-        CATB = 5  # tilted 40-60 degrees
-    elif B > 60:
-        CATB = 6  # tilted >60 degrees
-    else:
-        CATB = None
-        print('B not in expected range')
+    # 1: (-122.5, -67], 3: (-67, -22.5], 5: (-22.5, 22.5], 4: (22.5, 67], 2: (67, 122.5], 6: otherwise
+    CATteta_z = CATTETA_Z_OF_BIN[np.digitize(teta_z, CATTETA_Z_BINS, right=True)]
+
+    # 1: flat roof (0-5 degrees), 2: 5-15, 3: 15-25, 4: 25-40, 5: 40-60, 6: tilted >60 degrees
+    B = np.degrees(B)
+    CATB = np.digitize(B, CATB_BINS, right=True)
+    CATB = _category_in_range(CATB, (B > 0), 'B not in expected range')
 
+    # 1 to 10: yearly radiation in steps of 10% of the maximum
     GB_percent = GB / Max_Isol
-    # if 0 < GB_percent <= 0.05:
-    #     CATGB = 1
-    # elif 0.05 < GB_percent <= 0.1:
-    #     CATGB = 2
-    # elif 0.1 < GB_percent <= 0.15:
-    #     CATGB = 3
-    # elif 0.15 < GB_percent <= 0.2:
-    #     CATGB = 4
-    # elif 0.2 < GB_percent <= 0.25:
-    #     CATGB = 5
-    # elif 0.25 < GB_percent <= 0.3:
-    #     CATGB = 6
-    # elif 0.3 < GB_percent <= 0.35:
-    #     CATGB = 7
-    # elif 0.35 < GB_percent <= 0.4:
-    #     CATGB = 8
-    # elif 0.4 < GB_percent<= 0.45:
-    #     CATGB = 9
-    # elif 0.45 < GB_percent <= 0.5:
-    #     CATGB = 10
-    # elif 0.5 < GB_percent <= 0.55:
-    #     CATGB = 11
-    # elif 0.55 < GB_percent <= 0.6:
-    #     CATGB = 12
-    # elif 0.6 < GB_percent <= 0.65:
-    #     CATGB = 13
-    # elif 0.65 < GB_percent <= 0.7:
-    #     CATGB = 14
-    # elif 0.7 < GB_percent <= 0.75:
-    #     CATGB = 15
-    # elif 0.75 < GB_percent <= 0.8:
-    #     CATGB = 16
-    # elif 0.8 < GB_percent <= 0.85:
-    #     CATGB = 17
-    # elif 0.85 < GB_percent <= 0.9:
-    #     CATGB = 18
-    # elif 0.9 < GB_percent <= 0.95:
-    #     CATGB = 19
-    # elif 0.95 < GB_percent <= 1:
-    #     CATGB = 20
-    # else:
-    #     CATGB = None
-    #     print('GB not in expected range')
-
-
-    if 0 < GB_percent <= 0.1:
-        CATGB = 1
-    elif 0.1 < GB_percent <= 0.2:
-        CATGB = 2
-    elif 0.2 < GB_percent <= 0.3:
-        CATGB = 3
-    elif 0.3 < GB_percent <= 0.4:
-        CATGB = 4
-    elif 0.4 < GB_percent<= 0.5:
-        CATGB = 5
-    elif 0.5 < GB_percent <= 0.6:
-        CATGB = 6
-    elif 0.6 < GB_percent <= 0.7:
-        CATGB = 7
-    elif 0.7 < GB_percent <= 0.8:
-        CATGB = 8
-    elif 0.8 < GB_percent <= 0.9:
-        CATGB = 9
-    elif 0.90 < GB_percent <= 1:
-        CATGB = 10
-    else:
-        CATGB = None
-        print('GB not in expected range')
+    CATGB = np.digitize(GB_percent, CATGB_BINS, right=True)
+    CATGB = _category_in_range(CATGB, (GB_percent > 0) & (GB_percent <= 1), 'GB not in expected range')
 
     return CATteta_z, CATB, CATGB
 
 
+def _category_in_range(category, in_range, message):
+    """
+    Set the categories of the values out of range to nan, so that these sensors are left out of the groups.
+    """
+    if in_range.all():
+        return category
+    print(message)
+    return np.where(in_range, category, np.nan)
+
+
 def calc_surface_azimuth(xdir, ydir, B):
     """
     Calculate surface azimuth from the surface normal vector (x,y,z) and tilt angle (B).
@@ -619,25 +544,18 @@ def calc_surface_azimuth(xdir, ydir, B):
     :param xdir: surface normal vector x in (x,y,z) representing east-west direction
     :param ydir: surface normal vector y in (x,y,z) representing north-south direction
     :param B: surface tilt angle in degree
-    :type xdir: float
-    :type ydir: float
-    :type B: float
+    :type xdir: float or np.array
+    :type ydir: float or np.array
+    :type B: float or np.array
     :returns surface azimuth: the azimuth of the surface of a solar panel in degree
-    :rtype surface_azimuth: float
+    :rtype surface_azimuth: float or np.array
 
     """
-    B = radians(B)
-    teta_z = degrees(asin(xdir / sin(B)))
+    B = np.radians(B)
+    teta_z = np.degrees(np.arcsin(xdir / np.sin(B)))
     # set the surface azimuth with on the sing convention (E,N)=(+,+)
-    if xdir < 0:
-        if ydir < 0:
-            surface_azimuth = 180 + teta_z  # (xdir,ydir) = (-,-)
-        else:
-            surface_azimuth = 360 + teta_z  # (xdir,ydir) = (-,+)
-    elif ydir < 0:
-        surface_azimuth = 180 + teta_z  # (xdir,ydir) = (+,-)
-    else:
-        surface_azimuth = teta_z  # (xdir,ydir) = (+,+)
+    # (xdir,ydir) = (-,-) and (+,-): 180 + teta_z, (-,+): 360 + teta_z, (+,+): teta_z
+    surface_azimuth = np.where(ydir < 0, 180 + teta_z, np.where(xdir < 0, 360 + teta_z, teta_z))
     return surface_azimuth  # degree
 
 
@@ -703,7 +621,7 @@ def calc_groups(radiation_of_sensors_clean, sensors_metadata_cat):
     :return hourlydata_groups: mean hourly radiation of sensors in each group
     :rtype hourlydata_groups: dataframe
     :return number_points: number of sensor points in each group
-    :rtype number_points: array
+    :rtype number_points: np.array
     :return prop_observers: values of sensor properties of each group of sensors
     :rtype prop_observers: dataframe
     """
@@ -713,31 +631,21 @@ def calc_groups(radiation_of_sensors_clean, sensors_metadata_cat):
     sensors_metadata_cat['surface'] = sensors_metadata_cat.index
     sensor_groups_ob = sensors_metadata_cat.groupby(
         ['CATB', 'CATGB', 'CATteta_z', 'type_orientation'])  # group the sensors by categories
-    number_groups = sensor_groups_ob.size().count() # TODO: check if redundant, it is actually equal to group_count
-    group_keys = sensor_groups_ob.groups.keys()
-
-    # empty dicts to store results
-    group_properties = {}
-    group_mean_radiations = {}
-    number_points = {}
-    group_count = 0
-    for key in group_keys:
-        # get surface names in group
-        surfaces_in_group = sensor_groups_ob['surface'].groups[key].values
-        number_points[group_count] = len(surfaces_in_group)
-        # write group properties
-        group_key = pd.Series({'CATB': key[0], 'CATGB': key[1], 'CATteta_z': key[2], 'type_orientation': key[3]})
-        group_info = pd.Series({'number_srfs': number_points, 'srfs': (''.join(surfaces_in_group))})
-        group_prop_sum = sensor_groups_ob.sum(numeric_only=True).loc[key][['AREA_m2', 'area_installed_module_m2']]
-        group_prop_mean = sensor_groups_ob.mean(numeric_only=True).loc[key].drop(['area_installed_module_m2', 'AREA_m2'])
-        group_properties[group_count] = pd.concat([group_key, group_prop_mean, group_prop_sum, group_info])
-        # calculate mean radiation among surfaces in group
-        group_mean_radiations[group_count] = radiation_of_sensors_clean[surfaces_in_group].mean(axis=1).values
-
-        group_count += 1
-
-    prop_observers = pd.DataFrame(group_properties).T
-    hourlydata_groups = pd.DataFrame(group_mean_radiations)
+    number_groups = sensor_groups_ob.ngroups
+    group_of_surface = sensor_groups_ob.ngroup()  # group number of each surface, following the sorted group keys
+
+    # write group properties
+    number_points = sensor_groups_ob.size().to_numpy()
+    group_prop_sum = sensor_groups_ob[['AREA_m2', 'area_installed_module_m2']].sum()
+    group_prop_mean = sensor_groups_ob.mean(numeric_only=True).drop(columns=['area_installed_module_m2', 'AREA_m2'])
+    prop_observers = pd.concat([group_prop_mean, group_prop_sum], axis=1).reset_index()
+    prop_observers['number_srfs'] = number_points
+    prop_observers['srfs'] = sensor_groups_ob['surface'].agg(''.join).to_numpy()
+
+    # calculate mean radiation among surfaces in group
+    surfaces = group_of_surface.index
+    group_mean_radiations = radiation_of_sensors_clean[surfaces].T.groupby(group_of_surface.to_numpy()).mean()
+    hourlydata_groups = pd.DataFrame(group_mean_radiations.to_numpy(dtype=np.float64).T)
 
     panel_groups = {'number_groups': number_groups, 'number_points': number_points,
                     'hourlydata_groups': hourlydata_groups, 'prop_observers': prop_observers}
@@ -779,3 +687,21 @@ def cal_radiation_type(group, hourly_radiation, weather_data):
         'I_diffuse']  # calculate direct radiation
     radiation_Wperm2.fillna(0, inplace=True)  # set nan to zero
     return radiation_Wperm2
+
+
+def calc_radiation_type_groups(hourly_radiation, weather_data):
+    """
+    Array version of :py:func:`cal_radiation_type` that splits the radiation of all groups at once.
+
+    :param hourly_radiation: mean hourly radiation of sensors in each group [Wh/m2], one column per group
+    :type hourly_radiation: dataframe
+    :param weather_data: weather data read from the epw file
+    :type weather_data: dataframe
+    :return: total, diffuse and direct radiation [Wh/m2], arrays of shape (number of groups, hours)
+    :rtype: tuple of np.array
+    """
+    I_sol = hourly_radiation.to_numpy(dtype=np.float64).T
+    I_diffuse = weather_data.ratio_diffhout.to_numpy() * I_sol  # calculate diffuse radiation
+    I_direct = I_sol - I_diffuse  # calculate direct radiation
+    # set nan to zero
+    return np.nan_to_num(I_sol), np.nan_to_num(I_diffuse), np.nan_to_num(I_direct)